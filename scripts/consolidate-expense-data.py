@@ -6,22 +6,52 @@ Expected output format:
 Date | Description | Vendor | Amount | GL Code | Department
 """
 
+import io
 import re
 import csv
+import sys
+from array import array
+from operator import itemgetter
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import NamedTuple
 
-class ExpenseLine(NamedTuple):
-    date: str
-    description: str
-    vendor: str
-    amount: float
-    gl_code: str
-    department: str
-    source_file: str
+# Optional DFA-based engines for the combined vendor regex. The alternation is
+# tens of mostly-literal branches run against many short strings - ideal for
+# hyperscan (SIMD multi-pattern) or re2 (linear-time DFA). Both are optional;
+# stdlib re is the fallback and always works.
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+try:
+    import re2
+except ImportError:
+    re2 = None
+# Optional Aho-Corasick automaton for the literal vendor prefilter: one
+# linear pass over the description regardless of how many literals there are.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Expenses are kept as a struct-of-arrays: six parallel columns instead of one
+# tuple object per line. Aggregations become single C-level passes over a
+# column (sum over the float array, Counter over the vendor list) with no
+# per-element attribute lookups.
+def _new_columns() -> dict:
+    return {
+        'dates': [],
+        'descriptions': [],
+        'vendors': [],
+        'amounts': array('d'),
+        'gl_codes': [],
+        'departments': [],
+    }
 
 # Vendor extraction patterns - order matters (more specific first)
-VENDOR_PATTERNS = [
+_RAW_VENDOR_PATTERNS = [
     # Airlines
     (r'\bDelta\b|\bDELTA AIR\b', 'Delta Airlines'),
     (r'\bAmerican\b|\bAMERICAN AIR', 'American Airlines'),
@@ -95,91 +125,245 @@ VENDOR_PATTERNS = [
     (r'\bMeal\b', 'Meal'),
 ]
 
+# Vendor names are a closed vocabulary hashed millions of times by Counter;
+# interning makes those dict lookups pointer-identity comparisons.
+VENDOR_NAMES = [sys.intern(vendor) for _, vendor in _RAW_VENDOR_PATTERNS]
+
+# Most alternatives in the table are just \b-anchored literals - no real regex
+# machinery needed for the common case. Split each pattern on '|' and hoist the
+# literal alternatives into an ordered prefilter driven by C-level substring
+# scans; only the handful of genuinely complex alternatives (e.g.
+# \bRDU\b.*\bParking\b) stay on the regex engine. List-order priority is kept
+# by tracking pattern ids: the first literal hit caps the search, and a
+# complex pattern only wins with a strictly lower id.
+_LITERAL_ALT_RE = re.compile(r"(\\b)?((?:[A-Za-z0-9 &'\-]|\\[.'])+)(\\b)?$")
+_WORD_CHARS = frozenset(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_')
+
+def _upper_pattern(pattern: str) -> str:
+    """Uppercase the literal characters of a regex, leaving escapes intact.
+
+    A plain .upper() would turn \\b into \\B (non-boundary) and corrupt the
+    pattern, so escape sequences are copied through untouched.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == '\\' and i + 1 < len(pattern):
+            out.append(pattern[i:i + 2])
+            i += 2
+        else:
+            out.append(pattern[i].upper())
+            i += 1
+    return ''.join(out)
+
+# (uppercased literal, has leading \b, has trailing \b, pattern id)
+_LITERAL_VENDORS: list[tuple[str, bool, bool, int]] = []
+_COMPLEX_ALTS: list[tuple[int, str]] = []
+_seen = set()
+for _pid, (_pattern, _) in enumerate(_RAW_VENDOR_PATTERNS):
+    for _alt in _pattern.split('|'):
+        _m = _LITERAL_ALT_RE.fullmatch(_alt)
+        if _m:
+            _lit = _m.group(2).replace('\\.', '.').replace("\\'", "'").upper()
+            _key = (_lit, bool(_m.group(1)), bool(_m.group(3)))
+            if _key not in _seen:
+                _seen.add(_key)
+                _LITERAL_VENDORS.append((*_key, _pid))
+        else:
+            # Uppercase the pattern itself so it can run case-sensitively
+            # against the already-uppercased description; duplicate-case
+            # alternatives collapse in the process.
+            _alt_upper = _upper_pattern(_alt)
+            if (_pid, _alt_upper) not in _seen:
+                _seen.add((_pid, _alt_upper))
+                _COMPLEX_ALTS.append((_pid, _alt_upper))
+del _seen
+
+def _contains_word(haystack: str, needle: str, bound_start: bool, bound_end: bool) -> bool:
+    """Substring test honoring the \\b anchors of the original alternative."""
+    pos = haystack.find(needle)
+    end = pos + len(needle)
+    while pos >= 0:
+        if ((not bound_start or pos == 0 or haystack[pos - 1] not in _WORD_CHARS)
+                and (not bound_end or end == len(haystack)
+                     or haystack[end] not in _WORD_CHARS)):
+            return True
+        pos = haystack.find(needle, pos + 1)
+        end = pos + len(needle)
+    return False
+
+_NO_MATCH = len(VENDOR_NAMES)  # sentinel id, worse than any real pattern
+
+if ahocorasick is not None and _LITERAL_VENDORS:
+    # Compile the literals into one automaton: every occurrence of every
+    # literal is reported in a single pass, so cost stops scaling with the
+    # number of vendors. Words are keyed by text, so entries sharing a
+    # literal (differing only in boundary flags) are grouped.
+    _ac_words: dict[str, list] = {}
+    for _entry in _LITERAL_VENDORS:
+        _ac_words.setdefault(_entry[0], []).append(_entry)
+    _AC = ahocorasick.Automaton()
+    for _word, _entries in _ac_words.items():
+        _AC.add_word(_word, _entries)
+    _AC.make_automaton()
+    del _ac_words
+
+    def _scan_literals(desc_upper: str) -> int:
+        best = _NO_MATCH
+        length = len(desc_upper)
+        for end_pos, entries in _AC.iter(desc_upper):
+            for literal, bound_start, bound_end, pid in entries:
+                if pid >= best:
+                    continue
+                start = end_pos - len(literal) + 1
+                if (bound_start and start > 0
+                        and desc_upper[start - 1] in _WORD_CHARS):
+                    continue
+                if (bound_end and end_pos + 1 < length
+                        and desc_upper[end_pos + 1] in _WORD_CHARS):
+                    continue
+                best = pid
+        return best
+else:
+    def _scan_literals(desc_upper: str) -> int:
+        for literal, bound_start, bound_end, pid in _LITERAL_VENDORS:
+            if _contains_word(desc_upper, literal, bound_start, bound_end):
+                return pid
+        return _NO_MATCH
+
+if hyperscan is not None and _COMPLEX_ALTS:
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[alt.encode() for _, alt in _COMPLEX_ALTS],
+        ids=[pid for pid, _ in _COMPLEX_ALTS],
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_COMPLEX_ALTS))
+
+    def _search_complex(desc_upper: str, best: int) -> int:
+        hits: list[int] = []
+        _HS_DB.scan(desc_upper.encode(),
+                    match_event_handler=lambda pid, start, end, flags, ctx: hits.append(pid))
+        return min(min(hits), best) if hits else best
+else:
+    _ENGINE = re2 if re2 is not None else re
+    _COMPLEX_PATTERNS = [(pid, _ENGINE.compile(alt)) for pid, alt in _COMPLEX_ALTS]
+
+    def _search_complex(desc_upper: str, best: int) -> int:
+        # Entries are in ascending id order, so the first hit below the
+        # literal prefilter's id is the winner.
+        for pid, pat in _COMPLEX_PATTERNS:
+            if pid >= best:
+                break
+            if pat.search(desc_upper):
+                return pid
+        return best
+
+def _match_vendor_index(description: str) -> int | None:
+    # Uppercase once and match everything case-sensitively against it - the
+    # engine then does pure byte compares instead of per-character case
+    # folding on every attempt.
+    desc_upper = description.upper()
+    best = _scan_literals(desc_upper)
+    best = _search_complex(desc_upper, best)
+    return best if best < _NO_MATCH else None
+
+# Common processor/airport-code prefixes stripped before the fallback vendor
+# guess. A tuple so str.startswith checks all of them in one C call.
+_SKIP_PREFIXES = ('PAYPAL', 'DNH*', 'PY', 'DMI*', 'IAH', 'ATL', 'MSY', 'DFW', 'RDU')
+
+# Descriptions repeat heavily across reports (same "STARBUCKS #1234" etc.),
+# and the mapping is deterministic, so memoize. The corpus is bounded by the
+# number of unique descriptions (a few thousand), hence maxsize=None.
+@lru_cache(maxsize=None)
 def extract_vendor(description: str) -> str:
     """Extract vendor name from description using pattern matching."""
-    for pattern, vendor in VENDOR_PATTERNS:
-        if re.search(pattern, description, re.IGNORECASE):
-            return vendor
-    # If no pattern matches, return first significant word(s)
-    words = description.split()
-    if words:
-        # Remove common prefixes
-        for skip in ['PAYPAL', 'DNH*', 'PY', 'DMI*', 'IAH', 'ATL', 'MSY', 'DFW', 'RDU']:
-            if words[0].startswith(skip):
-                words = words[1:]
-                break
-        return ' '.join(words[:2]) if len(words) >= 2 else words[0] if words else 'Unknown'
+    idx = _match_vendor_index(description)
+    if idx is not None:
+        return VENDOR_NAMES[idx]
+    # If no pattern matches, return first significant word(s). maxsplit=3
+    # guarantees the first three tokens are whole words without splitting the
+    # tail, and indexing past a skipped prefix avoids re-slicing the list.
+    words = description.split(None, 3)
+    start = 1 if words and words[0].startswith(_SKIP_PREFIXES) else 0
+    remaining = len(words) - start
+    if remaining >= 2:
+        return sys.intern(f'{words[start]} {words[start + 1]}')
+    if remaining == 1:
+        return sys.intern(words[start])
     return 'Unknown'
 
+# Strips currency symbol, thousands separators and whitespace in one C-level
+# pass instead of chained .replace()/.strip() allocations.
+_AMOUNT_TRANSLATION = str.maketrans('', '', '$, \t')
+
 def parse_amount(amount_str: str) -> float:
     """Parse amount string like '$1,234.56' to float."""
-    clean = amount_str.replace('$', '').replace(',', '').strip()
     try:
-        return float(clean)
+        return float(amount_str.translate(_AMOUNT_TRANSLATION))
     except ValueError:
         return 0.0
 
-def parse_markdown_file(filepath: Path) -> list[ExpenseLine]:
-    """Parse a markdown expense report and extract expense lines."""
-    expenses = []
-    content = filepath.read_text()
+# Table structure markers, compiled once. Both are anchored and used with
+# .match(), so the engine bails within the first few characters on the vast
+# majority of lines. Bytes patterns - the parse loop stays in the bytes
+# domain until a row's fields are actually kept.
+_HEADER_RE = re.compile(rb'^\|\s*Date\s*\|.*GL Acct')
+_SEP_RE = re.compile(rb'^\|-{3,}')
+
+def parse_markdown_file(filepath: Path) -> dict:
+    """Parse a markdown expense report into columns of expense data."""
+    columns = _new_columns()
 
     # Find the expenses table
     # Pattern: | Date | GL Acct/Job | Dept/Phase | Description | Amount |
-    lines = content.split('\n')
     in_table = False
     header_found = False
 
-    for line in lines:
-        line = line.strip()
-
-        # Skip empty lines
-        if not line:
-            continue
-
-        # Check for table start
-        if '| Date |' in line and 'GL Acct' in line:
-            in_table = True
-            header_found = True
-            continue
-
-        # Skip separator line
-        if in_table and line.startswith('|---'):
-            continue
-
-        # Check for table end (total line or empty)
-        if in_table and ('**Total' in line or not line.startswith('|')):
-            in_table = False
-            continue
-
-        # Parse expense line
-        if in_table and line.startswith('|'):
-            parts = [p.strip() for p in line.split('|')]
-            # Remove empty first/last elements from split
-            parts = [p for p in parts if p]
+    # Stream line by line rather than materializing the whole file plus a
+    # split list; works the same for arbitrarily large reports. Binary mode
+    # skips the per-line UTF-8 decode - the reports are ASCII in practice,
+    # and only the fields of kept rows are decoded.
+    with filepath.open('rb') as f:
+        for line in f:
+            line = line.strip()
+
+            # Skip empty lines
+            if not line:
+                continue
+
+            # Outside the table, the only line of interest is the header -
+            # a single containment test skips all surrounding prose.
+            if not in_table:
+                if _HEADER_RE.match(line):
+                    in_table = True
+                    header_found = True
+                continue
+
+            # Check for table end (total line or non-table prose)
+            if not line.startswith(b'|') or b'**Total' in line:
+                in_table = False
+                continue
+
+            # Skip separator line
+            if _SEP_RE.match(line):
+                continue
+
+            # Parse expense line - strip the outer pipes before splitting so
+            # no empty first/last cells are produced that need filtering out
+            parts = [p.strip() for p in line.strip(b'|').split(b'|')]
 
             if len(parts) >= 5:
-                date = parts[0]
-                gl_code = parts[1].replace('.', '')  # Remove trailing dots
-                department = parts[2]
-                description = parts[3]
-                amount_str = parts[4]
-
-                # Extract vendor from description
-                vendor = extract_vendor(description)
-                amount = parse_amount(amount_str)
-
-                expenses.append(ExpenseLine(
-                    date=date,
-                    description=description,
-                    vendor=vendor,
-                    amount=amount,
-                    gl_code=gl_code,
-                    department=department,
-                    source_file=filepath.name
-                ))
-
-    return expenses
+                description = parts[3].decode('utf-8')
+                columns['dates'].append(parts[0].decode('utf-8'))
+                columns['descriptions'].append(description)
+                columns['vendors'].append(extract_vendor(description))
+                columns['amounts'].append(parse_amount(parts[4].decode('utf-8')))
+                # GL codes and departments are low-cardinality; interning
+                # collapses the repeats to one allocation apiece.
+                columns['gl_codes'].append(sys.intern(parts[1].replace(b'.', b'').decode('utf-8')))  # Remove trailing dots
+                columns['departments'].append(sys.intern(parts[2].decode('utf-8')))
+
+    return columns
 
 def main():
     # Find all markdown files
@@ -188,51 +372,60 @@ def main():
 
     print(f"Found {len(md_files)} markdown files")
 
-    all_expenses = []
-    for md_file in md_files:
-        expenses = parse_markdown_file(md_file)
-        print(f"  {md_file.name}: {len(expenses)} expenses")
-        all_expenses.extend(expenses)
-
-    print(f"\nTotal expenses: {len(all_expenses)}")
-
-    # Write CSV output
+    # Each file parses independently (regex + string work, CPU-bound), so fan
+    # out across cores. The compiled vendor matcher is module-level state, so
+    # workers inherit it on fork without re-compiling per task.
+    with ProcessPoolExecutor() as executor:
+        per_file = list(executor.map(parse_markdown_file, md_files, chunksize=4))
+
+    columns = _new_columns()
+    for md_file, parsed in zip(md_files, per_file):
+        print(f"  {md_file.name}: {len(parsed['dates'])} expenses")
+        for key, values in parsed.items():
+            columns[key].extend(values)
+
+    print(f"\nTotal expenses: {len(columns['dates'])}")
+
+    # Render the CSV into an in-memory buffer via writerows and flush it with
+    # a single file write, instead of one write call per row. GL totals still
+    # accumulate in the same pass through the generator feeding writerows;
+    # the other reductions (unique counts, total, vendor counts) stay as
+    # single C-level calls over their columns.
     output_csv = md_folder / 'historical-expenses-consolidated.csv'
+    gl_totals = defaultdict(float)
+
+    def rows_with_gl_totals():
+        for row in zip(columns['dates'], columns['descriptions'],
+                       columns['vendors'], columns['amounts'],
+                       columns['gl_codes'], columns['departments']):
+            gl_totals[row[4]] += row[3]
+            yield row
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(['Date', 'Description', 'Vendor', 'Amount', 'GL Code', 'Department'])
+    writer.writerows(rows_with_gl_totals())
     with open(output_csv, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Date', 'Description', 'Vendor', 'Amount', 'GL Code', 'Department'])
-        for exp in all_expenses:
-            writer.writerow([exp.date, exp.description, exp.vendor, exp.amount, exp.gl_code, exp.department])
+        f.write(buffer.getvalue())
 
     print(f"\nWritten to: {output_csv}")
 
-    # Summary stats
-    vendors = set(exp.vendor for exp in all_expenses)
-    gl_codes = set(exp.gl_code for exp in all_expenses)
-    departments = set(exp.department for exp in all_expenses)
-
     print(f"\n=== Summary ===")
-    print(f"Unique vendors: {len(vendors)}")
-    print(f"Unique GL codes: {len(gl_codes)}")
-    print(f"Unique departments: {len(departments)}")
-    print(f"Total amount: ${sum(exp.amount for exp in all_expenses):,.2f}")
+    print(f"Unique vendors: {len(set(columns['vendors']))}")
+    print(f"Unique GL codes: {len(set(columns['gl_codes']))}")
+    print(f"Unique departments: {len(set(columns['departments']))}")
+    print(f"Total amount: ${sum(columns['amounts']):,.2f}")
 
     # Top vendors by count
-    vendor_counts = {}
-    for exp in all_expenses:
-        vendor_counts[exp.vendor] = vendor_counts.get(exp.vendor, 0) + 1
+    vendor_counts = Counter(columns['vendors'])
 
     print(f"\n=== Top 15 Vendors by Frequency ===")
-    for vendor, count in sorted(vendor_counts.items(), key=lambda x: -x[1])[:15]:
+    for vendor, count in vendor_counts.most_common(15):
         print(f"  {vendor}: {count}")
 
-    # GL code breakdown
-    gl_totals = {}
-    for exp in all_expenses:
-        gl_totals[exp.gl_code] = gl_totals.get(exp.gl_code, 0) + exp.amount
-
+    # GL code breakdown (accumulated during the CSV pass)
     print(f"\n=== GL Code Totals ===")
-    for gl, total in sorted(gl_totals.items(), key=lambda x: -x[1]):
+    for gl, total in sorted(gl_totals.items(), key=itemgetter(1), reverse=True):
         print(f"  {gl}: ${total:,.2f}")
 
 if __name__ == '__main__':